@@ -0,0 +1 @@
+"""Project analysis source modules."""
@@ -0,0 +1,329 @@
+"""
+Project analysis orchestrator.
+
+Ties the analyzers together: repository structure, git history, feature
+mapping, developer profiling, risk assessment and report generation.
+"""
+
+import argparse
+import dataclasses
+import functools
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# PEP 366 bootstrap: only plain `python analyze_project.py` pays for the
+# path fix-up; `python -m source.analyze_project` and worker-process
+# re-imports resolve the package directly.
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "source"
+    import source  # noqa: F401
+
+from .config import AnalysisConfig, BusinessValue, Complexity, FeatureStatus, RiskLevel
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(o):
+    """Encoder hook for the types the JSON libraries do not handle."""
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if isinstance(o, datetime):
+        return o.isoformat()
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    return o.__dict__
+
+
+class ProjectAnalyzer:
+    """Runs the full analysis pipeline against one repository."""
+
+    def __init__(self, config: Optional[AnalysisConfig] = None, max_workers: Optional[int] = None):
+        self.config = config or AnalysisConfig()
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.analysis_data: Dict[str, Any] = {}
+        self._shard_dir: Optional[Path] = None
+        self._shard_prefix: str = ""
+
+    # The analyzers are constructed (and their modules imported) on first
+    # use so that --help runs and worker-process bootstrap do not pay for
+    # the whole pipeline's import graph up front.
+
+    @functools.cached_property
+    def repo_analyzer(self):
+        from .repo_analyzer import RepositoryAnalyzer
+        return RepositoryAnalyzer(self.config)
+
+    @functools.cached_property
+    def git_analyzer(self):
+        from .git_analyzer import GitAnalyzer
+        return GitAnalyzer(self.config, max_workers=self.max_workers)
+
+    @functools.cached_property
+    def feature_mapper(self):
+        from .feature_mapper import FeatureMapper
+        return FeatureMapper(self.config, max_workers=self.max_workers)
+
+    @functools.cached_property
+    def developer_analyzer(self):
+        from .developer_analyzer import DeveloperAnalyzer
+        return DeveloperAnalyzer(self.config, max_workers=self.max_workers)
+
+    @functools.cached_property
+    def risk_assessor(self):
+        from .risk_assessor import RiskAssessor
+        return RiskAssessor(self.config)
+
+    @functools.cached_property
+    def report_generator(self):
+        from .report_generator import ReportGenerator
+        return ReportGenerator(self.config)
+
+    def analyze_project(self, repo_path: str, output_path: str) -> Dict:
+        """Run every analysis stage and generate the report."""
+        logger.info("%s\nAnalyzing project: %s\n%s", "=" * 60, repo_path, "=" * 60)
+
+        # Stage dependency graph: repository structure and git history are
+        # independent roots; every later stage depends on the commit list,
+        # so only the two roots are worth fanning out.
+        if self.max_workers > 1:
+            logger.info("Step 1-2/6: Analyzing repository structure and git history in parallel...")
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                repo_future = executor.submit(self.repo_analyzer.analyze_repository, repo_path)
+                git_future = executor.submit(self.git_analyzer.analyze_git_history, repo_path)
+                repo_structure = repo_future.result()
+                git_data = git_future.result()
+        else:
+            logger.info("Step 1/6: Analyzing repository structure...")
+            repo_structure = self.repo_analyzer.analyze_repository(repo_path)
+            logger.info("Step 2/6: Analyzing git history...")
+            git_data = self.git_analyzer.analyze_git_history(repo_path)
+
+        self.analysis_data["repo_structure"] = {
+            "file_count": repo_structure["file_count"],
+            "total_lines": repo_structure["total_lines"],
+            "technologies": repo_structure["technologies"],
+            "config_info": repo_structure["config_info"],
+        }
+        # The per-commit collections grow without bound on large repos, so
+        # they are streamed to JSONL shards instead of being carried in
+        # analysis_data until the final serialization. The bounded
+        # summaries (features, profiles, patterns) stay in memory.
+        # Shard names carry the report stem: batch runs share one output
+        # directory and must not clobber each other's shards.
+        report_path = Path(output_path)
+        self._shard_dir = report_path.parent / "stages"
+        self._shard_dir.mkdir(parents=True, exist_ok=True)
+        self._shard_prefix = report_path.stem
+        commits = git_data["commits"]
+        self._write_shard("commits", commits)
+        self._write_shard("author_stats", git_data["author_stats"])
+        self.analysis_data["commit_patterns"] = git_data["commit_patterns"]
+        self.analysis_data["total_commits"] = git_data["total_commits"]
+
+        logger.info("Step 3/6: Identifying features...")
+        features = self.feature_mapper.identify_features(commits, repo_structure)
+        self.analysis_data["features"] = features
+
+        logger.info("Step 4/6: Analyzing developers...")
+        developer_profiles = self.developer_analyzer.analyze_developers(
+            commits, git_data["author_stats"]
+        )
+        self.analysis_data["developer_profiles"] = developer_profiles
+        try:
+            self.analysis_data["team_dynamics"] = self.developer_analyzer.analyze_team_dynamics(
+                developer_profiles, commits
+            )
+        except Exception as e:
+            logger.warning("Team dynamics analysis failed: %s", e)
+            self.analysis_data["team_dynamics"] = {}
+
+        logger.info("Step 5/6: Assessing risks...")
+        try:
+            self.analysis_data["risks"] = self.risk_assessor.assess_risks(
+                commits, features, developer_profiles, repo_structure
+            )
+        except Exception as e:
+            logger.warning("Risk assessment failed: %s", e)
+            self.analysis_data["risks"] = {}
+
+        self._perform_additional_analysis(commits)
+        # The per-commit records are on disk now; release them before the
+        # report/serialization step so peak memory stays bounded.
+        del commits, git_data
+
+        logger.info("Step 6/6: Generating report...")
+        self.report_generator.generate_report(self.analysis_data, repo_path, output_path)
+        self.save_analysis_data(output_path)
+
+        logger.info(
+            "%s\nAnalysis complete. Report written to %s\n%s", "=" * 60, output_path, "=" * 60
+        )
+        return self.analysis_data
+
+    def _perform_additional_analysis(self, commits):
+        """Derive cross-stage summary metrics from the collected data."""
+        # pandas is only needed for these bulk reductions, so it is
+        # imported here rather than at module load.
+        import pandas as pd
+
+        # Work from the original CommitInfo objects; their datetimes never
+        # went through a format/parse round-trip.
+        if commits:
+            dates = pd.to_datetime([c.date for c in commits if c.date], utc=True)
+            start = dates.min()
+            end = dates.max()
+            self.analysis_data["project_timeline"] = {
+                "start_date": start.isoformat(),
+                "end_date": end.isoformat(),
+                "duration_days": (end - start).days,
+            }
+
+        features = self.analysis_data.get("features", [])
+        if features:
+            features_df = pd.DataFrame({
+                "complexity": [f.complexity for f in features],
+                "estimated_hours": [f.estimated_hours for f in features],
+            })
+            counts = (
+                features_df["complexity"]
+                .value_counts()
+                .reindex([Complexity.LOW, Complexity.MEDIUM, Complexity.HIGH], fill_value=0)
+            )
+            complexity_counts = {
+                "low": int(counts.iloc[0]),
+                "medium": int(counts.iloc[1]),
+                "high": int(counts.iloc[2]),
+            }
+            total_hours = float(features_df["estimated_hours"].sum())
+        else:
+            complexity_counts = {"low": 0, "medium": 0, "high": 0}
+            total_hours = 0.0
+        self.analysis_data["feature_summary"] = {
+            "complexity_counts": complexity_counts,
+            "total_estimated_hours": round(total_hours, 1),
+        }
+
+        profiles = self.analysis_data.get("developer_profiles", [])
+        critical_developers: list = []
+        if profiles:
+            profiles_df = pd.DataFrame({
+                "name": [p.name for p in profiles],
+                "business_value": [p.business_value for p in profiles],
+            })
+            critical_developers = profiles_df.loc[
+                profiles_df["business_value"] == BusinessValue.CRITICAL, "name"
+            ].tolist()
+        self.analysis_data["team_analysis"] = {
+            "team_size": len(profiles),
+            "critical_developers": critical_developers,
+        }
+
+        self.analysis_data["project_health_score"] = self._calculate_project_health_score()
+
+    def _calculate_project_health_score(self) -> float:
+        """Blend quality, completion, risk and concentration into one score."""
+        quality = self.analysis_data.get("commit_patterns", {}).get("message_quality")
+        features = self.analysis_data.get("features", [])
+        completion = (
+            sum(1 for f in features if f.status is FeatureStatus.COMPLETED) / len(features)
+            if features else None
+        )
+        risk_level = self.analysis_data.get("risks", {}).get("overall_risk_level")
+        risk_map = {RiskLevel.LOW: 0.2, RiskLevel.MEDIUM: 0.5, RiskLevel.HIGH: 0.8}
+        concentration = self.analysis_data.get("team_dynamics", {}).get(
+            "knowledge_concentration"
+        )
+
+        # Fixed-width factor vector plus a presence mask: missing factors
+        # drop out of the mean without per-factor control flow.
+        vals = np.array([
+            quality if quality is not None else 0.0,
+            completion if completion is not None else 0.0,
+            1 - risk_map.get(risk_level, 0.5),
+            1 - (concentration if concentration is not None else 0.0),
+        ], dtype=np.float32)
+        mask = np.array([
+            quality is not None,
+            completion is not None,
+            risk_level is not None,
+            concentration is not None,
+        ], dtype=np.bool_)
+        if not mask.any():
+            return 0.5
+        return round(float(vals[mask].mean()), 2)
+
+    def _write_shard(self, name: str, records) -> None:
+        """Stream one stage's records to stages/<report stem>_<name>.jsonl."""
+        path = self._shard_dir / f"{self._shard_prefix}_{name}.jsonl"
+        if orjson is not None:
+            with path.open("wb") as f:
+                for record in records:
+                    f.write(orjson.dumps(record, default=_json_default))
+                    f.write(b"\n")
+        else:
+            import json
+            with path.open("w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, default=_json_default))
+                    f.write("\n")
+
+    def save_analysis_data(self, output_path: str):
+        """Write the raw analysis data next to the markdown report."""
+        report_path = Path(output_path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        # str.replace('.md', ...) would corrupt any path whose directory
+        # component happens to contain '.md'; derive from the stem instead.
+        json_path = report_path.with_name(report_path.stem + "_data.json")
+        if orjson is not None:
+            # orjson walks dataclasses and datetimes natively in C, so the
+            # stored objects are converted exactly once, inside the encoder;
+            # only containers it does not know (e.g. sets) hit the hook.
+            json_path.write_bytes(orjson.dumps(
+                self.analysis_data,
+                option=orjson.OPT_INDENT_2,
+                default=_json_default,
+            ))
+        else:
+            import json
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    self.analysis_data, f, indent=2, ensure_ascii=False, default=_json_default
+                )
+        logger.info("Raw analysis data saved to %s", json_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a project analysis report.")
+    parser.add_argument("repo_path", help="Path to the git repository to analyze")
+    parser.add_argument(
+        "-o", "--output", default="PROJECT_ANALYSIS_REPORT.md",
+        help="Output path for the markdown report",
+    )
+    parser.add_argument("--config", help="Optional JSON config file")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(),
+        help="Number of worker processes for independent stages (1 = serial)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    config = AnalysisConfig(args.config) if args.config else AnalysisConfig()
+    analyzer = ProjectAnalyzer(config, max_workers=args.workers)
+    analyzer.analyze_project(args.repo_path, args.output)
+
+
+if __name__ == "__main__":
+    main()
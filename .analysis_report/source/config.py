@@ -0,0 +1,335 @@
+"""
+Configuration for the project analysis system.
+
+Central place for the tunable knobs used by the analyzers: complexity
+thresholds, git history limits, commit-message classification patterns,
+technology detection tables and report options.
+"""
+
+import enum
+import json
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+# Sample-size thresholds and the confidence multiplier for each bucket;
+# searchsorted with side="right" reproduces the >= semantics of the old
+# elif chain in a single C call.
+_SZ_BOUNDS = np.array([10, 20, 50, 100])
+_SZ_MULT = np.array([0.5, 0.7, 0.8, 0.9, 1.0])
+
+
+# Categorical values used throughout analysis_data. StrEnum members are
+# singletons, so the hot equality checks in the aggregation loops hit
+# the pointer-identity fast path instead of comparing characters, while
+# JSON output keeps the human-readable strings.
+
+class Complexity(enum.StrEnum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+class FeatureStatus(enum.StrEnum):
+    COMPLETED = "completed"
+    PLANNED = "planned"
+
+
+class BusinessValue(enum.StrEnum):
+    CRITICAL = "Critical"
+    HIGH = "High"
+    MEDIUM = "Medium"
+    LOW = "Low"
+
+
+class RiskLevel(enum.StrEnum):
+    HIGH = "High"
+    MEDIUM = "Medium"
+    LOW = "Low"
+
+
+@lru_cache(maxsize=4096)
+def _complexity_level(
+    loc: int, commit_count: int,
+    low_loc: int, medium_loc: int, low_commits: int, medium_commits: int,
+) -> Complexity:
+    """Pure, memoized core of AnalysisConfig.get_complexity_level."""
+    if loc <= low_loc and commit_count <= low_commits:
+        return Complexity.LOW
+    elif loc <= medium_loc and commit_count <= medium_commits:
+        return Complexity.MEDIUM
+    return Complexity.HIGH
+
+
+@lru_cache(maxsize=4096)
+def _time_estimate(
+    complexity: str, commit_count: int,
+    low_hours: float, medium_hours: float, high_hours: float,
+    hours_per_commit: float, testing_buffer: float,
+) -> float:
+    """Pure, memoized core of AnalysisConfig.get_time_estimate."""
+    if complexity == Complexity.LOW:
+        base = low_hours
+    elif complexity == Complexity.MEDIUM:
+        base = medium_hours
+    else:
+        base = high_hours
+    estimate = base + commit_count * hours_per_commit
+    return estimate * (1 + testing_buffer)
+
+
+@dataclass(slots=True)
+class ComplexityThresholds:
+    """Thresholds used to bucket features into low/medium/high complexity."""
+
+    low_loc: int = 500
+    medium_loc: int = 2000
+    low_commits: int = 10
+    medium_commits: int = 50
+
+    # Base time estimates (hours) per complexity bucket
+    low_hours: float = 20.0
+    medium_hours: float = 80.0
+    high_hours: float = 200.0
+
+    # Additional hours per commit beyond the bucket baseline
+    hours_per_commit: float = 1.5
+
+
+@dataclass(slots=True)
+class GitAnalysisConfig:
+    """Configuration for git history extraction and commit classification."""
+
+    max_commit_history: int = 15000
+    recent_days: int = 90
+    # Bound git-side work: only look back this many days (None = full
+    # history), and walk every ref only when cross-branch analysis is
+    # wanted.
+    since_days: Optional[int] = None
+    include_all_refs: bool = True
+    # --numstat emits one line per changed file; the analyzers only need
+    # the three per-commit totals, which --shortstat gives in one line.
+    # Opt in here if file-level stats are ever needed downstream.
+    per_file_stats: bool = False
+    # When set, only the K earliest feature timelines are returned,
+    # via a bounded heap selection instead of a full sort.
+    top_features_k: Optional[int] = None
+
+    FEATURE_PATTERNS: Optional[List[str]] = None
+    BUG_FIX_PATTERNS: Optional[List[str]] = None
+    REFACTOR_PATTERNS: Optional[List[str]] = None
+    DOCUMENTATION_PATTERNS: Optional[List[str]] = None
+
+    # Lazily built by the classifier property; slotted classes cannot use
+    # functools.cached_property, which needs an instance __dict__.
+    _classifier: Optional["re.Pattern[str]"] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.FEATURE_PATTERNS is None:
+            self.FEATURE_PATTERNS = [
+                "feat:", "feature:", "add:", "new:", "implement:",
+            ]
+        if self.BUG_FIX_PATTERNS is None:
+            self.BUG_FIX_PATTERNS = [
+                "fix:", "bug:", "patch:", "hotfix:", "bugfix:",
+            ]
+        if self.REFACTOR_PATTERNS is None:
+            self.REFACTOR_PATTERNS = [
+                "refactor:", "cleanup:", "restructure:", "optimize:",
+            ]
+        if self.DOCUMENTATION_PATTERNS is None:
+            self.DOCUMENTATION_PATTERNS = [
+                "docs:", "doc:", "readme:", "documentation:",
+            ]
+        self.validate_patterns()
+
+    def validate_patterns(self) -> None:
+        """Fail fast on duplicate classification patterns.
+
+        Duplicates double-count commits in per-pattern matching and
+        bloat the compiled classifier. Re-run after overlaying patterns
+        from a config file; a ValueError (not an assert) survives -O.
+        """
+        for name in (
+            "FEATURE_PATTERNS", "BUG_FIX_PATTERNS",
+            "REFACTOR_PATTERNS", "DOCUMENTATION_PATTERNS",
+        ):
+            patterns = getattr(self, name)
+            if len(set(patterns)) != len(patterns):
+                raise ValueError(f"{name} has duplicate patterns")
+
+    @property
+    def classifier(self) -> "re.Pattern[str]":
+        """Single compiled automaton matching every category's patterns.
+
+        One scan of a lowercased message replaces the four per-category
+        `any(pattern in message ...)` substring sweeps downstream.
+        """
+        if self._classifier is None:
+            groups = []
+            for name, patterns in (
+                ("feature", self.FEATURE_PATTERNS),
+                ("bug_fix", self.BUG_FIX_PATTERNS),
+                ("refactor", self.REFACTOR_PATTERNS),
+                ("documentation", self.DOCUMENTATION_PATTERNS),
+            ):
+                alternation = "|".join(map(re.escape, sorted(set(patterns))))
+                groups.append(f"(?P<{name}>{alternation})")
+            self._classifier = re.compile("|".join(groups))
+        return self._classifier
+
+    def classify(self, message_lower: str) -> Set[str]:
+        """Return the set of categories whose patterns occur in the message."""
+        return {m.lastgroup for m in self.classifier.finditer(message_lower)}
+
+
+@dataclass(slots=True)
+class TechnologyStackConfig:
+    """File patterns used to detect the technologies present in a repository."""
+
+    FRONTEND_TECH: Optional[Dict[str, List[str]]] = None
+    BACKEND_TECH: Optional[Dict[str, List[str]]] = None
+    BUILD_TOOLS: Optional[Dict[str, List[str]]] = None
+    TESTING_TOOLS: Optional[Dict[str, List[str]]] = None
+
+    # Inverted indexes built lazily by build_index().
+    _suffix_index: Optional[Dict[str, List[tuple]]] = field(
+        default=None, repr=False, compare=False
+    )
+    _name_index: Optional[Dict[str, List[tuple]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.FRONTEND_TECH is None:
+            self.FRONTEND_TECH = {
+                "React": ["*.jsx", "*.tsx"],
+                "Vue": ["*.vue"],
+                "Angular": ["angular.json"],
+                "Flutter": ["*.dart", "pubspec.yaml"],
+                "HTML/CSS": ["*.html", "*.css", "*.scss"],
+            }
+        if self.BACKEND_TECH is None:
+            self.BACKEND_TECH = {
+                "Python": ["*.py"],
+                "Node.js": ["package.json", "*.js", "*.ts"],
+                "Java": ["*.java", "pom.xml"],
+                "Go": ["*.go", "go.mod"],
+                "Rust": ["*.rs", "Cargo.toml"],
+                "Ruby": ["*.rb", "Gemfile"],
+                "PHP": ["*.php", "composer.json"],
+            }
+        if self.BUILD_TOOLS is None:
+            self.BUILD_TOOLS = {
+                "Docker": ["Dockerfile", "docker-compose.yml"],
+                "Make": ["Makefile"],
+                "Gradle": ["build.gradle", "*.gradle"],
+                "Webpack": ["webpack.config.js"],
+                "Vite": ["vite.config.js", "vite.config.ts"],
+            }
+        if self.TESTING_TOOLS is None:
+            self.TESTING_TOOLS = {
+                "Pytest": ["pytest.ini", "conftest.py"],
+                "Jest": ["jest.config.js"],
+                "Cypress": ["cypress.json", "cypress.config.js"],
+            }
+
+    def categories(self) -> Dict[str, Dict[str, List[str]]]:
+        """The detection tables keyed by report category name."""
+        return {
+            "frontend": self.FRONTEND_TECH,
+            "backend": self.BACKEND_TECH,
+            "build_tools": self.BUILD_TOOLS,
+            "testing": self.TESTING_TOOLS,
+        }
+
+    def build_index(self) -> tuple:
+        """Invert the glob tables into O(1) lookup dicts.
+
+        Every pattern is either a ``*.ext`` suffix glob or a literal file
+        name, so matching a file needs one extension lookup plus one name
+        lookup instead of fnmatch over every pattern of every technology.
+        Returns ``(suffix_index, name_index)`` mapping to lists of
+        ``(category, technology)`` pairs.
+        """
+        if self._suffix_index is None:
+            suffix_index: Dict[str, List[tuple]] = {}
+            name_index: Dict[str, List[tuple]] = {}
+            for category, table in self.categories().items():
+                for tech, patterns in table.items():
+                    for pattern in patterns:
+                        if pattern.startswith("*."):
+                            suffix_index.setdefault(pattern[1:].lower(), []).append(
+                                (category, tech)
+                            )
+                        else:
+                            name_index.setdefault(pattern, []).append((category, tech))
+            self._suffix_index = suffix_index
+            self._name_index = name_index
+        return self._suffix_index, self._name_index
+
+
+@dataclass(slots=True)
+class ReportConfig:
+    """Options controlling report generation."""
+
+    template_path: str = "templates/project_analysis.template.md"
+    include_confidence_levels: bool = True
+    include_methodology: bool = True
+    testing_buffer: float = 0.2
+
+
+class AnalysisConfig:
+    """Aggregate configuration object passed to every analyzer."""
+
+    def __init__(self, config_path: Optional[str] = None):
+        self.complexity = ComplexityThresholds()
+        self.git = GitAnalysisConfig()
+        self.technology = TechnologyStackConfig()
+        self.report = ReportConfig()
+        if config_path:
+            self._load_config(config_path)
+
+    def _load_config(self, config_path: str):
+        """Overlay values from a JSON config file onto the defaults."""
+        with open(config_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for section_name in ("complexity", "git", "report"):
+            section = data.get(section_name, {})
+            target = getattr(self, section_name)
+            for key, value in section.items():
+                if hasattr(target, key):
+                    setattr(target, key, value)
+        # The defaults were validated in __post_init__; the overlaid
+        # pattern lists are the ones that can actually carry duplicates.
+        self.git.validate_patterns()
+
+    def get_complexity_level(self, loc: int, commit_count: int) -> Complexity:
+        """Classify a feature as low/medium/high from its size and churn.
+
+        The thresholds are passed through so the lru_cache key stays
+        valid even when a config file overrides them.
+        """
+        c = self.complexity
+        return _complexity_level(
+            loc, commit_count, c.low_loc, c.medium_loc, c.low_commits, c.medium_commits
+        )
+
+    def get_time_estimate(self, complexity: str, commit_count: int) -> float:
+        """Estimate development hours for a feature."""
+        c = self.complexity
+        return _time_estimate(
+            complexity, commit_count,
+            c.low_hours, c.medium_hours, c.high_hours,
+            c.hours_per_commit, self.report.testing_buffer,
+        )
+
+    def get_confidence_score(self, data_quality: float, sample_size: int) -> float:
+        """Scale a raw quality score by how much data backs it."""
+        multiplier = _SZ_MULT[np.searchsorted(_SZ_BOUNDS, sample_size, side="right")]
+        return min(float(data_quality * multiplier), 1.0)
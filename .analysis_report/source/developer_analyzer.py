@@ -0,0 +1,554 @@
+"""
+Developer and team analysis.
+
+Builds per-developer profiles (expertise, knowledge areas, contribution
+patterns, code-quality indicators) from the commit history and derives
+team-level dynamics such as knowledge concentration and bus factor.
+"""
+
+import functools
+import logging
+import math
+import operator
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+from .config import AnalysisConfig, BusinessValue
+from .git_analyzer import AuthorStats, CommitInfo
+
+logger = logging.getLogger(__name__)
+
+
+def _quality_kernel(tc, fc, ml, conv):
+    """Mean heuristic quality score over one author's commit columns.
+
+    Written as a tight scalar loop so numba can compile it to a native
+    kernel; interpreted, it would be slower than the np.select path, so
+    it is only used when the JIT is available.
+    """
+    acc = 0.0
+    for i in range(tc.shape[0]):
+        score = 0.5
+        if tc[i] <= 50:
+            score += 0.3
+        elif tc[i] <= 200:
+            score += 0.2
+        elif tc[i] <= 500:
+            score += 0.1
+        if fc[i] <= 3:
+            score += 0.2
+        elif fc[i] <= 10:
+            score += 0.1
+        if ml[i] >= 15:
+            score += 0.2
+        if conv[i]:
+            score += 0.2
+        acc += score if score < 1.0 else 1.0
+    return acc / tc.shape[0]
+
+
+if njit is not None:
+    _quality_kernel = njit(cache=True, fastmath=True)(_quality_kernel)
+
+
+def _build_profile(analyzer: "DeveloperAnalyzer", author_stat, idx, table, expertise, knowledge):
+    """Module-level task wrapper so worker processes can unpickle it."""
+    return analyzer._create_developer_profile(author_stat, idx, table, expertise, knowledge)
+
+
+_COMPANY_BY_DOMAIN = {
+    "gmail.com": "Independent",
+    "outlook.com": "Independent",
+    "hotmail.com": "Independent",
+    "yahoo.com": "Independent",
+    "users.noreply.github.com": "Independent",
+}
+_ROLE_INDICATORS = {
+    "admin": "Administrator",
+    "dev": "Developer",
+    "eng": "Engineer",
+    "design": "Designer",
+    "qa": "QA Engineer",
+    "test": "QA Engineer",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _extract_role_and_company(email: str) -> tuple:
+    """Guess a developer's role and company from their email address.
+
+    Pure on the email string, so results are memoized; authors sharing a
+    bot or domain resolve from the cache.
+    """
+    local, _, domain = email.partition("@")
+    company = _COMPANY_BY_DOMAIN.get(domain)
+    if company is None:
+        company = domain.split(".")[0].capitalize() if domain else "Unknown"
+    role = "Developer"
+    for indicator, title in _ROLE_INDICATORS.items():
+        if indicator in local.lower():
+            role = title
+            break
+    return role, company
+
+
+# Conventional-commit markers are prefixes, so a single tuple
+# startswith covers them without substring scans mid-message.
+_CONV_PREFIXES = (
+    "feat:", "fix:", "docs:", "refactor:",
+    "feature:", "bug:", "patch:", "cleanup:", "add:",
+)
+
+
+@dataclass(slots=True)
+class CommitTable:
+    """Columnar (struct-of-arrays) view of a commit history.
+
+    Everything the analyzers read per commit lives in one array per
+    field, so the original CommitInfo objects can be dropped after
+    conversion and all numeric work stays in NumPy.
+    """
+
+    authors: np.ndarray
+    msgs_lower: List[str]
+    is_conv: np.ndarray
+    total_changes: np.ndarray
+    files_changed: np.ndarray
+    msg_len: np.ndarray
+    ts: np.ndarray
+
+    @classmethod
+    def from_commits(cls, commits: List[CommitInfo]) -> "CommitTable":
+        """Convert a list of CommitInfo objects in one pass."""
+        n = len(commits)
+        msgs_lower = [c.message_lower or c.message.lower() for c in commits]
+        return cls(
+            authors=np.array([c.author for c in commits], dtype=object),
+            msgs_lower=msgs_lower,
+            is_conv=np.fromiter(
+                (m.startswith(_CONV_PREFIXES) for m in msgs_lower), dtype=bool, count=n
+            ),
+            total_changes=np.fromiter(
+                (c.lines_added + c.lines_deleted for c in commits), dtype=np.int32, count=n
+            ),
+            files_changed=np.fromiter(
+                (c.files_changed for c in commits), dtype=np.int32, count=n
+            ),
+            msg_len=np.fromiter((len(c.message) for c in commits), dtype=np.int32, count=n),
+            ts=np.fromiter(
+                (int(c.date.timestamp()) for c in commits), dtype=np.int64, count=n
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.msgs_lower)
+
+    def take(self, idx: np.ndarray) -> "CommitTable":
+        """New table holding the rows selected by ``idx``, in that order."""
+        return CommitTable(
+            authors=self.authors[idx],
+            msgs_lower=[self.msgs_lower[i] for i in idx],
+            is_conv=self.is_conv[idx],
+            total_changes=self.total_changes[idx],
+            files_changed=self.files_changed[idx],
+            msg_len=self.msg_len[idx],
+            ts=self.ts[idx],
+        )
+
+
+@dataclass
+class DeveloperProfile:
+    """Derived profile for a single developer."""
+
+    name: str
+    email: str
+    role: str
+    company: str
+    total_commits: int
+    lines_added: int
+    lines_deleted: int
+    expertise_areas: List[str] = field(default_factory=list)
+    knowledge_areas: List[str] = field(default_factory=list)
+    contribution_pattern: str = ""
+    contribution_score: float = 0.0
+    business_value: BusinessValue = BusinessValue.MEDIUM
+    collaboration_score: float = 0.0
+    code_quality_score: float = 0.0
+
+
+class DeveloperAnalyzer:
+    """Derives developer profiles and team dynamics from commits."""
+
+    EXPERTISE_KEYWORDS = {
+        "Feature Development": ["feat:", "feature:", "add:"],
+        "Bug Fixing": ["fix:", "bug:", "patch:"],
+        "Refactoring": ["refactor:", "cleanup:", "restructure:"],
+        "Documentation": ["docs:", "doc:", "readme:"],
+        "Testing": ["test:", "tests:", "spec:"],
+    }
+    TECH_KEYWORDS = {
+        "frontend": ["react", "vue", "angular", "css", "html", "ui", "component"],
+        "backend": ["api", "server", "database", "endpoint", "service"],
+        "mobile": ["ios", "android", "flutter", "mobile", "app"],
+        "devops": ["docker", "deploy", "ci", "pipeline", "kubernetes"],
+        "data": ["sql", "query", "migration", "schema", "analytics"],
+    }
+
+    def __init__(self, config: AnalysisConfig, max_workers: Optional[int] = None):
+        self.config = config
+        # Process budget for the profile fan-out; callers already
+        # running inside an outer pool pass 1 so workers do not fork
+        # workers.
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        # One alternation per area, fed to pandas' vectorized matcher so
+        # each area is a single C scan over the whole message column.
+        self._expertise_patterns = {
+            area: "|".join(map(re.escape, keywords))
+            for area, keywords in self.EXPERTISE_KEYWORDS.items()
+        }
+        self._knowledge_patterns = {
+            area: "|".join(map(re.escape, keywords))
+            for area, keywords in self.TECH_KEYWORDS.items()
+        }
+        # Table from the last analyze_developers run, kept so the
+        # team-dynamics helpers can reuse it instead of rescanning the
+        # commit list; _table_source identifies the exact list it was
+        # built from.
+        self._table: Union[CommitTable, None] = None
+        self._table_source: Union[List[CommitInfo], None] = None
+
+    def __getstate__(self):
+        # The cached table is a per-process convenience; leaving it in
+        # would ship the full history with every pooled profile task on
+        # top of the author slice the task actually needs.
+        state = self.__dict__.copy()
+        state["_table"] = None
+        state["_table_source"] = None
+        return state
+
+    def _as_table(self, commits: Union[List[CommitInfo], CommitTable]) -> CommitTable:
+        """Accept either representation; reuse the cached table when it
+        was built from this exact commit list."""
+        if isinstance(commits, CommitTable):
+            return commits
+        # Identity, not length: an analyzer reused across repositories
+        # (or fed an equally sized subset) must not get the previous
+        # history back.
+        if self._table is not None and self._table_source is commits:
+            return self._table
+        return CommitTable.from_commits(commits)
+
+    def _aggregate_area_flags(self, author_codes: np.ndarray, msgs_lower: List[str]) -> tuple:
+        """Per-author hit matrices for every expertise and technology area.
+
+        One vectorized ``str.contains`` per area flags the whole message
+        column at once, and a single groupby collapses the flags into a
+        per-author integer count matrix; the thresholds are then applied
+        to the whole matrix in one comparison rather than per author and
+        per area in Python. Returns ``(expertise_hits, knowledge_hits)``
+        boolean matrices indexed by author code.
+        """
+        import pandas as pd
+
+        msgs = pd.Series(msgs_lower, dtype=object)
+        frame: Dict[str, object] = {"author": author_codes}
+        for area, pattern in self._expertise_patterns.items():
+            frame["e/" + area] = msgs.str.contains(pattern, regex=True)
+        for area, pattern in self._knowledge_patterns.items():
+            frame["k/" + area] = msgs.str.contains(pattern, regex=True)
+        grouped = pd.DataFrame(frame).groupby("author", sort=True)
+        counts = grouped.sum().to_numpy(dtype=np.int64)
+        n_commits = grouped.size().to_numpy(dtype=np.int64)
+        n_exp = len(self._expertise_patterns)
+        expertise_hits = counts[:, :n_exp] >= n_commits[:, None] * 0.15
+        knowledge_hits = counts[:, n_exp:] > 0
+        return expertise_hits, knowledge_hits
+
+    def _areas_for(self, area_hits: tuple, block_id) -> tuple:
+        """Extract (expertise_areas, knowledge_areas) for one author."""
+        if block_id is None:
+            return [], []
+        expertise_hits, knowledge_hits = area_hits
+        expertise = [
+            area for area, hit in zip(self._expertise_patterns, expertise_hits[block_id])
+            if hit
+        ]
+        knowledge = [
+            area for area, hit in zip(self._knowledge_patterns, knowledge_hits[block_id])
+            if hit
+        ]
+        return expertise, knowledge
+
+    def analyze_developers(
+        self,
+        commits: Union[List[CommitInfo], CommitTable],
+        author_stats: List[AuthorStats],
+    ) -> List[DeveloperProfile]:
+        """Build a profile for every author found in the history.
+
+        Accepts either the raw CommitInfo list or an already-built
+        CommitTable; the list is converted once and never rescanned, so
+        callers holding only the table can drop the objects entirely.
+        """
+        table = self._as_table(commits)
+        # Factorize authors and permute every column once so each
+        # author's rows form one contiguous block; per-author access is
+        # then a cache-friendly [start:end) range instead of scattered
+        # indices gathered from a bucketing dict.
+        uniq, codes = np.unique(table.authors, return_inverse=True)
+        order = np.argsort(codes, kind="stable")
+        table = table.take(order)
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=uniq.size))))
+        block = {name: j for j, name in enumerate(uniq)}
+        self._table = table
+        self._table_source = commits if not isinstance(commits, CommitTable) else None
+        # Area flags aggregate over all authors at once; the per-author
+        # lists are then O(areas) lookups into the small hit matrices.
+        area_hits = self._aggregate_area_flags(codes[order], table.msgs_lower)
+
+        def author_idx(name: str) -> np.ndarray:
+            j = block.get(name)
+            if j is None:
+                return np.empty(0, dtype=np.intp)
+            return np.arange(offsets[j], offsets[j + 1], dtype=np.intp)
+
+        profiles = []
+        # Profiles are independent per author; fan out on real teams and
+        # stay serial below the pool's amortization point or when the
+        # budget (one core, or an outer pool) leaves no parallelism.
+        if len(author_stats) >= 4 and self.max_workers > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = []
+                for author_stat in author_stats:
+                    idx = author_idx(author_stat.name)
+                    expertise, knowledge = self._areas_for(
+                        area_hits, block.get(author_stat.name)
+                    )
+                    # Ship only the author's rows; each worker then indexes
+                    # a dense local copy instead of the full history.
+                    futures.append(pool.submit(
+                        _build_profile, self, author_stat,
+                        np.arange(idx.size, dtype=np.intp),
+                        table.take(idx),
+                        expertise, knowledge,
+                    ))
+                for future in futures:
+                    profiles.append(future.result())
+        else:
+            # No blanket try/except here: the scoring helpers are pure
+            # functions of the validated columns and a bug in them should
+            # surface, not be swallowed per author.
+            for author_stat in author_stats:
+                idx = author_idx(author_stat.name)
+                expertise, knowledge = self._areas_for(area_hits, block.get(author_stat.name))
+                profiles.append(self._create_developer_profile(
+                    author_stat, idx, table, expertise, knowledge
+                ))
+        # attrgetter keeps the sort key in C instead of dispatching a
+        # Python lambda per comparison.
+        return sorted(
+            profiles, key=operator.attrgetter("contribution_score"), reverse=True
+        )
+
+    def _create_developer_profile(
+        self,
+        author_stat: AuthorStats,
+        idx: np.ndarray,
+        table: CommitTable,
+        expertise_areas: List[str],
+        knowledge_areas: List[str],
+    ) -> DeveloperProfile:
+        """Assemble one developer's profile from their commit indices."""
+        # The email parse is the only step fed by unvalidated input, so
+        # it is the only one allowed to fail softly.
+        try:
+            role, company = _extract_role_and_company(author_stat.email)
+        except (AttributeError, TypeError) as e:
+            logger.warning(
+                "Could not parse role/company for %s: %s", author_stat.name, e
+            )
+            role, company = "Developer", "Unknown"
+        return DeveloperProfile(
+            name=author_stat.name,
+            email=author_stat.email,
+            role=role,
+            company=company,
+            total_commits=author_stat.total_commits,
+            lines_added=author_stat.lines_added,
+            lines_deleted=author_stat.lines_deleted,
+            expertise_areas=expertise_areas,
+            knowledge_areas=knowledge_areas,
+            contribution_pattern=self._determine_contribution_pattern(idx, table),
+            contribution_score=author_stat.commit_frequency,
+            business_value=self._assess_business_value(author_stat),
+            collaboration_score=self._calculate_collaboration_score(idx, table),
+            code_quality_score=self._calculate_code_quality_score(idx, table),
+        )
+
+    def _determine_contribution_pattern(self, idx: np.ndarray, table: CommitTable) -> str:
+        """Describe how regularly a developer contributes."""
+        if idx.size < 2:
+            return "Occasional contributor"
+        avg_gap = self._mean_gap_days(table.ts[idx])
+        if avg_gap <= 2:
+            return "High frequency, consistent contributor"
+        elif avg_gap <= 7:
+            return "Regular weekly contributor"
+        elif avg_gap <= 30:
+            return "Monthly contributor"
+        return "Occasional contributor"
+
+    def _assess_business_value(self, author_stat: AuthorStats) -> BusinessValue:
+        """Rate the business criticality of a developer's contributions."""
+        total_lines = author_stat.lines_added + author_stat.lines_deleted
+        if author_stat.total_commits >= 100 or total_lines >= 50000:
+            return BusinessValue.CRITICAL
+        elif author_stat.total_commits >= 30 or total_lines >= 10000:
+            return BusinessValue.HIGH
+        elif author_stat.total_commits >= 10:
+            return BusinessValue.MEDIUM
+        return BusinessValue.LOW
+
+    @staticmethod
+    def _mean_gap_days(timestamps: np.ndarray) -> float:
+        """Average whole-day gap between consecutive commits.
+
+        Floor division mirrors timedelta.days, which the Python loop this
+        replaces relied on.
+        """
+        ts = np.sort(timestamps)
+        return float((np.diff(ts) // 86400).mean())
+
+    def _calculate_collaboration_score(self, idx: np.ndarray, table: CommitTable) -> float:
+        """Score collaboration from merge activity and commit cadence."""
+        if idx.size == 0:
+            return 0.0
+        msgs_lower = table.msgs_lower
+        merge_count = sum(1 for i in idx if "merge" in msgs_lower[i])
+        score = 0.5 + min(merge_count / idx.size, 0.3)
+        if idx.size >= 2 and self._mean_gap_days(table.ts[idx]) <= 7:
+            score += 0.2
+        return min(score, 1.0)
+
+    def _calculate_code_quality_score(self, idx: np.ndarray, table: CommitTable) -> float:
+        """Heuristic quality score from commit size and message hygiene."""
+        if idx.size == 0:
+            return 0.0
+        tc = table.total_changes[idx]
+        fc = table.files_changed[idx]
+        if njit is not None:
+            return float(
+                _quality_kernel(tc, fc, table.msg_len[idx], table.is_conv[idx])
+            )
+        # One C reduction per column; np.select applies the same bucket
+        # thresholds the old per-commit elif chain did.
+        score = (
+            0.5
+            + np.select([tc <= 50, tc <= 200, tc <= 500], [0.3, 0.2, 0.1], 0.0)
+            + np.select([fc <= 3, fc <= 10], [0.2, 0.1], 0.0)
+            + 0.2 * (table.msg_len[idx] >= 15)
+            + 0.2 * table.is_conv[idx]
+        )
+        return float(np.minimum(score, 1.0).mean())
+
+    # Business-value weight used for the knowledge-concentration metric.
+    BV_WEIGHTS = {
+        BusinessValue.CRITICAL: 1.0, BusinessValue.HIGH: 0.6,
+        BusinessValue.MEDIUM: 0.3, BusinessValue.LOW: 0.1,
+    }
+
+    def analyze_team_dynamics(
+        self,
+        developer_profiles: List[DeveloperProfile],
+        commits: Union[List[CommitInfo], CommitTable],
+    ) -> Dict:
+        """Team-level metrics: collaboration model, concentration, stability."""
+        table = self._as_table(commits)
+        # One pass over the profiles feeds every profile-derived metric;
+        # the per-metric helpers previously rescanned and re-filtered the
+        # list four times.
+        bv_counts: Counter = Counter()
+        primary: List[str] = []
+        secondary: List[str] = []
+        distribution: Dict[str, int] = {}
+        total = 0.0
+        top = 0.0
+        for p in developer_profiles:
+            bv_counts[p.business_value] += 1
+            if p.business_value in (BusinessValue.CRITICAL, BusinessValue.HIGH):
+                primary.append(p.name)
+            else:
+                secondary.append(p.name)
+            for area in p.knowledge_areas:
+                distribution[area] = distribution.get(area, 0) + 1
+            contribution = self.BV_WEIGHTS.get(p.business_value, 0.1) * p.contribution_score
+            total += contribution
+            top = max(top, contribution)
+
+        return {
+            "collaboration_model": self._determine_collaboration_model(bv_counts),
+            "knowledge_distribution": distribution,
+            "contributor_tiers": {"primary": primary, "secondary": secondary},
+            "knowledge_concentration": top / total if total else 0.0,
+            "bus_factor": self._calculate_bus_factor(developer_profiles),
+            "team_stability": self._assess_team_stability(table),
+            "communication_patterns": self._analyze_communication_patterns(table),
+        }
+
+    def _determine_collaboration_model(self, bv_counts: Counter) -> str:
+        """Characterize how centralized development is."""
+        critical = bv_counts[BusinessValue.CRITICAL]
+        if critical == 1 and bv_counts[BusinessValue.HIGH] == 0:
+            return "Single maintainer"
+        elif critical <= 2:
+            return "Core team with contributors"
+        return "Distributed team"
+
+    def _calculate_bus_factor(self, developer_profiles: List[DeveloperProfile]) -> int:
+        """Number of developers holding ~70% of the project knowledge.
+
+        The old sort-and-walk always stopped at the first count >= 0.7*N,
+        so only the team size ever mattered; the closed form gives the
+        same answer without the sort.
+        """
+        n = len(developer_profiles)
+        return 0 if n == 0 else math.ceil(n * 0.7)
+
+    def _assess_team_stability(self, table: CommitTable) -> str:
+        """Compare recently active authors against the historical set."""
+        if len(table) == 0:
+            return "unknown"
+        # Factorize authors to int codes once; "recently active" is then
+        # a boolean timestamp mask plus a C-level unique count instead of
+        # per-commit Python set insertion.
+        uniq, codes = np.unique(table.authors, return_inverse=True)
+        cutoff = table.ts.max() - self.config.git.recent_days * 86400
+        recent = np.unique(codes[table.ts > cutoff]).size
+        retention = recent / uniq.size
+        if retention >= 0.75:
+            return "stable"
+        elif retention >= 0.4:
+            return "moderate"
+        return "high turnover"
+
+    def _analyze_communication_patterns(self, table: CommitTable) -> Dict:
+        """Summarize commit-message quality across the team."""
+        if len(table) == 0:
+            return {}
+        avg_length = float(table.msg_len.mean())
+        return {
+            "average_message_length": avg_length,
+            "conventional_commit_ratio": float(table.is_conv.mean()),
+            "quality": "good" if avg_length >= 20 else "terse",
+        }
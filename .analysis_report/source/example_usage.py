@@ -0,0 +1,105 @@
+"""
+Example usage of the project analysis system.
+
+Shows how to run the analyzer against a single repository or a batch of
+repositories.
+"""
+
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "source"
+    import source  # noqa: F401
+
+from .analyze_project import ProjectAnalyzer
+from .config import AnalysisConfig
+
+logger = logging.getLogger(__name__)
+
+
+def analyze_single_repository(repo_path: str, output_path: str, max_workers=None):
+    """Analyze one repository and return its analysis data."""
+    config = AnalysisConfig()
+    analyzer = ProjectAnalyzer(config, max_workers=max_workers)
+    return analyzer.analyze_project(repo_path, output_path)
+
+
+def _batch_output_path(repo_path: str, output_dir: str) -> str:
+    """Report path for one repository in a batch run."""
+    repo_name = os.path.basename(repo_path.rstrip("/"))
+    return os.path.join(output_dir, f"{repo_name}_analysis.md")
+
+
+def analyze_multiple_repositories(repo_paths, output_dir: str):
+    """Analyze a batch of repositories, one worker process per repo.
+
+    Each analysis is fully independent (its own config and output
+    file), so batches fan out across a process pool; max_workers=1
+    propagates through ProjectAnalyzer into every internal pool, so
+    pooled analyzers stay fully serial instead of oversubscribing the
+    cores the pool already claims. A single repository runs inline
+    without pool overhead.
+    """
+    repo_paths = list(repo_paths)
+    results = []
+    workers = min(os.cpu_count() or 1, len(repo_paths))
+    if workers <= 1:
+        for repo_path in repo_paths:
+            try:
+                data = analyze_single_repository(
+                    repo_path, _batch_output_path(repo_path, output_dir)
+                )
+                results.append((repo_path, data))
+            except Exception as e:
+                logger.warning("Failed to analyze %s: %s", repo_path, e)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                analyze_single_repository,
+                repo_path,
+                _batch_output_path(repo_path, output_dir),
+                1,
+            ): repo_path
+            for repo_path in repo_paths
+        }
+        for future in as_completed(futures):
+            repo_path = futures[future]
+            try:
+                results.append((repo_path, future.result()))
+            except Exception as e:
+                logger.warning("Failed to analyze %s: %s", repo_path, e)
+    return results
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    repo_path = sys.argv[1] if len(sys.argv) > 1 else "."
+    # One stat decides everything about repo_path; no repeat
+    # os.path.exists round-trips for the same answer.
+    if not os.path.exists(repo_path):
+        logger.error("Repository path does not exist: %s", repo_path)
+        return
+    logger.info("Analyzing repository: %s", repo_path)
+    output_path = os.path.join(repo_path, "PROJECT_ANALYSIS_REPORT.md")
+    analyze_single_repository(repo_path, output_path)
+
+    extra_repos = sys.argv[2:]
+    if extra_repos:
+        existing = []
+        for path in extra_repos:
+            try:
+                os.stat(path)
+            except OSError:
+                continue
+            existing.append(path)
+        analyze_multiple_repositories(existing, os.path.dirname(output_path) or ".")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Report generation.
+
+Populates the stakeholder-focused markdown template with the collected
+analysis data and writes the final report.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+from .config import AnalysisConfig
+
+
+class ReportGenerator:
+    """Fills the project analysis template from analysis data."""
+
+    def __init__(self, config: AnalysisConfig):
+        self.config = config
+
+    def generate_report(self, analysis_data: Dict, repo_path: str, output_path: str) -> str:
+        """Render the report and write it to output_path."""
+        template = self._load_template()
+        replacements = self._build_replacements(analysis_data, repo_path)
+        report = template
+        for placeholder, value in replacements.items():
+            report = report.replace(f"[{placeholder}]", str(value))
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(report)
+        return output_path
+
+    def _load_template(self) -> str:
+        template_path = Path(__file__).parent.parent / self.config.report.template_path
+        if template_path.exists():
+            with open(template_path, "r", encoding="utf-8") as f:
+                return f.read()
+        # Minimal inline fallback when the template is not shipped alongside.
+        return (
+            "# [PROJECT_NAME] - Project Analysis Report\n\n"
+            "_Generated on: [CURRENT_DATE]_\n\n"
+            "- Total commits: [TOTAL_COMMITS]\n"
+            "- Contributing developers: [DEV_COUNT]\n"
+            "- Analysis period: [START_DATE] - [END_DATE]\n"
+            "- Technology stack: [TECH_STACK]\n"
+        )
+
+    def _build_replacements(self, analysis_data: Dict, repo_path: str) -> Dict[str, str]:
+        """Compute the placeholder values the template needs."""
+        timeline = analysis_data.get("project_timeline", {})
+        technologies = analysis_data.get("repo_structure", {}).get("technologies", {})
+        stack = ", ".join(
+            tech for techs in technologies.values() for tech in techs
+        ) or "Unknown"
+        return {
+            "PROJECT_NAME": Path(repo_path).resolve().name,
+            "CURRENT_DATE": datetime.now().strftime("%Y-%m-%d"),
+            "TOTAL_COMMITS": analysis_data.get("total_commits", 0),
+            "DEV_COUNT": len(analysis_data.get("developer_profiles", [])),
+            "START_DATE": timeline.get("start_date", "unknown"),
+            "END_DATE": timeline.get("end_date", "unknown"),
+            "DURATION": f"{timeline.get('duration_days', 0)} days",
+            "TECH_STACK": stack,
+        }
@@ -0,0 +1,100 @@
+"""
+Risk assessment.
+
+Derives technical, team and business risks from the outputs of the
+other analyzers and produces an overall risk level with mitigations.
+"""
+
+from typing import Dict, List
+
+from .config import AnalysisConfig, BusinessValue, Complexity, RiskLevel
+
+
+class RiskAssessor:
+    """Aggregates analysis outputs into a stakeholder risk assessment."""
+
+    def __init__(self, config: AnalysisConfig):
+        self.config = config
+
+    def assess_risks(
+        self,
+        commits: List,
+        features: List,
+        developer_profiles: List,
+        repo_structure: Dict,
+    ) -> Dict:
+        """Produce the combined risk picture for the report."""
+        technical = self._assess_technical_risks(features, repo_structure)
+        team = self._assess_team_risks(developer_profiles)
+        business = self._assess_business_risks(features)
+        all_risks = technical + team + business
+        return {
+            "technical_risks": technical,
+            "team_risks": team,
+            "business_risks": business,
+            "overall_risk_level": self._overall_level(all_risks),
+        }
+
+    def _assess_technical_risks(self, features: List, repo_structure: Dict) -> List[Dict]:
+        risks = []
+        high_complexity = [
+            f for f in features if getattr(f, "complexity", None) is Complexity.HIGH
+        ]
+        if len(high_complexity) > len(features) * 0.3 and features:
+            risks.append({
+                "name": "High complexity concentration",
+                "level": RiskLevel.HIGH,
+                "mitigation": "Break down large features and add integration tests.",
+            })
+        total_lines = repo_structure.get("total_lines", 0)
+        doc_files = [f for f in repo_structure.get("files", []) if f.is_documentation]
+        if total_lines > 10000 and len(doc_files) < 3:
+            risks.append({
+                "name": "Insufficient documentation",
+                "level": RiskLevel.MEDIUM,
+                "mitigation": "Document architecture and onboarding paths.",
+            })
+        return risks
+
+    def _assess_team_risks(self, developer_profiles: List) -> List[Dict]:
+        risks = []
+        if len(developer_profiles) == 1:
+            risks.append({
+                "name": "Single point of failure",
+                "level": RiskLevel.HIGH,
+                "mitigation": "Onboard at least one additional maintainer.",
+            })
+        critical = [
+            p for p in developer_profiles if p.business_value is BusinessValue.CRITICAL
+        ]
+        if len(critical) == 1 and len(developer_profiles) > 2:
+            risks.append({
+                "name": "Knowledge concentration",
+                "level": RiskLevel.MEDIUM,
+                "mitigation": "Schedule knowledge-sharing sessions and pair rotation.",
+            })
+        return risks
+
+    def _assess_business_risks(self, features: List) -> List[Dict]:
+        risks = []
+        critical_features = [
+            f for f in features if getattr(f, "business_value", None) is BusinessValue.CRITICAL
+        ]
+        high_risk_critical = [
+            f for f in critical_features if getattr(f, "risk_level", None) is RiskLevel.HIGH
+        ]
+        if high_risk_critical:
+            risks.append({
+                "name": "Critical features carry high delivery risk",
+                "level": RiskLevel.HIGH,
+                "mitigation": "Prioritize stabilization of business-critical features.",
+            })
+        return risks
+
+    def _overall_level(self, risks: List[Dict]) -> RiskLevel:
+        levels = [r["level"] for r in risks]
+        if levels.count(RiskLevel.HIGH) >= 2:
+            return RiskLevel.HIGH
+        elif RiskLevel.HIGH in levels or levels.count(RiskLevel.MEDIUM) >= 2:
+            return RiskLevel.MEDIUM
+        return RiskLevel.LOW